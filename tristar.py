@@ -1,13 +1,16 @@
 import subprocess
 import os
 import sys
-import webbrowser
+import shutil
 import time
 from time import sleep
-from urllib.request import urlopen
-from urllib.error import URLError
-import threading
 import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+IS_WIN = sys.platform == "win32"
+_Popen = subprocess.Popen
 
 
 class TriStarApp:
@@ -21,8 +24,20 @@ class TriStarApp:
             self.project_dir = os.path.dirname(os.path.abspath(__file__))
         
         self.backend_dir = os.path.join(self.project_dir, 'backend')
+        self.data_dir = os.path.join(self.backend_dir, 'data')
+        self.logs_dir = os.path.join(self.backend_dir, 'logs')
+        self.exports_dir = os.path.join(self.backend_dir, 'exports')
+        self.package_json_path = os.path.join(self.backend_dir, 'package.json')
+        self.backend_modules_dir = os.path.join(self.backend_dir, 'node_modules')
+        self.frontend_modules_dir = os.path.join(self.project_dir, 'node_modules')
+        # npm ships as a .cmd shim on Windows, which CreateProcess only runs by full name
+        self.npm = shutil.which('npm.cmd' if IS_WIN else 'npm') or 'npm'
         self.frontend_process = None
         self.backend_process = None
+        self.install_processes = []
+        self.shutting_down = False
+        # Guards shutting_down and install_processes between install threads and cleanup()
+        self.install_lock = threading.Lock()
         signal.signal(signal.SIGINT, self.signal_handler)
 
     def signal_handler(self, signum, frame):
@@ -30,55 +45,36 @@ class TriStarApp:
         sys.exit(0)
 
     def run_command(self, command, cwd=None, check_output=False):
-        """Run a command and return the process object or output"""
+        """Run an argv list without a shell and return the process object or output"""
         if check_output:
             try:
-                return subprocess.check_output(command, cwd=cwd, shell=True, stderr=subprocess.STDOUT).decode()
+                return subprocess.check_output(command, cwd=cwd, stderr=subprocess.STDOUT).decode()
             except subprocess.CalledProcessError as e:
                 print(f"Error running command: {e.output.decode()}")
                 return None
+            except OSError as e:
+                print(f"Error running command: {e}")
+                return None
 
-        if sys.platform == "win32":
-            process = subprocess.Popen(
-                f"cmd.exe /c {command}",
-                cwd=cwd,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NEW_CONSOLE
-            )
-        else:
-            process = subprocess.Popen(
+        # Let the child write straight to the inherited console
+        if IS_WIN:
+            return _Popen(
                 command,
                 cwd=cwd,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
             )
-
-        def log_output(pipe, prefix):
-            try:
-                for line in pipe:
-                    print(f"{prefix}: {line.strip()}")
-            except: pass
-
-        threading.Thread(target=log_output, args=(process.stdout, "OUT"), daemon=True).start()
-        threading.Thread(target=log_output, args=(process.stderr, "ERR"), daemon=True).start()
-
-        return process
+        return _Popen(command, cwd=cwd)
 
     def check_dependencies(self):
         """Check and verify all required dependencies"""
         try:
-            npm_version = self.run_command('npm --version', check_output=True)
+            npm_version = self.run_command([self.npm, '--version'], check_output=True)
             if not npm_version:
                 print("❌ npm is not installed. Please install Node.js from https://nodejs.org/")
                 return False
             print(f"✓ npm version {npm_version.strip()} found")
             
-            node_version = self.run_command('node --version', check_output=True)
+            node_version = self.run_command(['node', '--version'], check_output=True)
             print(f"✓ Node.js version {node_version.strip()} found")
             
             return True
@@ -88,28 +84,53 @@ class TriStarApp:
 
     def ensure_directories(self):
         """Ensure all required directories exist"""
-        dirs = [
-            os.path.join(self.backend_dir, 'data'),
-            os.path.join(self.backend_dir, 'logs'),
-            os.path.join(self.backend_dir, 'exports')
-        ]
-        for d in dirs:
-            if not os.path.exists(d):
+        for d in (self.data_dir, self.logs_dir, self.exports_dir):
+            try:
                 os.makedirs(d)
-                print(f"✓ Created directory: {d}")
+            except FileExistsError:
+                continue
+            print(f"✓ Created directory: {d}")
+
+    def _deps_up_to_date(self, cwd):
+        """Check if node_modules was installed after the last package.json or lockfile change"""
+        try:
+            manifest_mtime = os.path.getmtime(os.path.join(cwd, 'package.json'))
+            lock_mtime = os.path.getmtime(os.path.join(cwd, 'package-lock.json'))
+            installed_mtime = os.path.getmtime(os.path.join(cwd, 'node_modules', '.package-lock.json'))
+        except OSError:
+            return False
+        return installed_mtime > max(manifest_mtime, lock_mtime)
 
     def install_dependencies(self, cwd, packages=""):
         """Install npm packages and handle errors"""
         try:
-            command = 'npm install'
+            if not packages and self._deps_up_to_date(cwd):
+                print(f"✓ Dependencies in {cwd} are up to date")
+                return True
+
+            command = [self.npm, 'install', '--prefer-offline', '--no-audit', '--no-fund']
             if packages:
-                command = f'npm install {packages}'
+                command += packages.split()
                 
-            print(f"Running: {command}")
-            result = self.run_command(command, cwd=cwd, check_output=True)
-            if result is not None:
+            print(f"Running: npm {' '.join(command[1:])} in {cwd}")
+            # npm writes its own progress straight to the console and stays in
+            # our process group so Ctrl+C reaches it
+            with self.install_lock:
+                if self.shutting_down:
+                    return False
+                process = _Popen(command, cwd=cwd)
+                self.install_processes.append(process)
+            try:
+                rc = process.wait()
+            finally:
+                with self.install_lock:
+                    self.install_processes.remove(process)
+            if rc == 0:
                 print("✓ Installation successful")
                 return True
+            # An install stopped by cleanup() is not a real failure
+            if not self.shutting_down:
+                print(f"❌ npm install exited with code {rc}")
             return False
         except Exception as e:
             print(f"❌ Error installing packages: {e}")
@@ -117,75 +138,193 @@ class TriStarApp:
 
     def wait_for_server(self, url, timeout=30):
         """Wait for a server to become available"""
+        from urllib.parse import urlsplit
+
         print(f"Waiting for server at {url}...")
-        start_time = time.time()
+        parts = urlsplit(url)
+        address = (parts.hostname, parts.port)
+        deadline = time.monotonic() + timeout
+        delay = 0.05
         dots = 0
-        while time.time() - start_time < timeout:
+        frames = tuple("." * n + " " * (3 - n) + "\r" for n in range(4))
+        while time.monotonic() < deadline:
             try:
-                urlopen(url)
-                print(f"\n✓ Server running at {url}")
-                return True
-            except URLError:
-                sleep(1)
-                dots = (dots + 1) % 4
-                print("." * dots + " " * (3-dots), end="\r", flush=True)
+                with socket.create_connection(address, timeout=0.1):
+                    pass
+            except OSError:
+                pass
+            else:
+                # The port is open; confirm the route is mounted if the URL names one
+                if not parts.path or self._head_ok(address, parts.path):
+                    print(f"\n✓ Server running at {url}")
+                    return True
+            sleep(min(delay, max(0, deadline - time.monotonic())))
+            delay = min(0.5, delay * 2)
+            dots = (dots + 1) % 4
+            sys.stdout.write(frames[dots])
+            sys.stdout.flush()
         print(f"\n❌ Server at {url} failed to start within {timeout} seconds")
         return False
 
-    def start_backend(self):
-        """Start the backend server"""
-        print("\n1. Installing backend dependencies...")
-        
-        # Check if package.json exists
-        package_json_path = os.path.join(self.backend_dir, 'package.json')
-        if not os.path.exists(package_json_path):
-            print("❌ Backend package.json not found!")
+    def _head_ok(self, address, path):
+        """Send a HEAD request and check the server answered without a 5xx"""
+        from http.client import HTTPConnection, HTTPException
+
+        conn = HTTPConnection(*address, timeout=0.25)
+        try:
+            conn.request("HEAD", path)
+            return conn.getresponse().status < 500
+        except (OSError, HTTPException):
             return False
-        
-        # Install dependencies using package.json
-        if not self.install_dependencies(self.backend_dir):
+        finally:
+            conn.close()
+
+    def start_backend(self, install, warm=False):
+        """Start the backend server, overlapping npm install when node_modules is warm"""
+        if not warm and not install.result():
+            print("❌ Failed to install backend dependencies")
+            return False
+        if self._launch_backend():
+            return True
+        if not warm:
+            return False
+
+        # The existing node_modules may be stale; retry once the install is done
+        print("Backend did not come up, waiting for npm install before retrying...")
+        if not install.result():
             print("❌ Failed to install backend dependencies")
             return False
+        self._stop_process(self.backend_process)
+        return self._launch_backend()
 
-        print("\n2. Starting Backend Server...")
-        self.backend_process = self.run_command('node server.js', cwd=self.backend_dir)
+    def _launch_backend(self):
+        """Spawn the backend and wait for its health check"""
+        print("\nStarting Backend Server...")
+        self.backend_process = self.run_command(['node', 'server.js'], cwd=self.backend_dir)
         
         # Wait for server with health check
         return self.wait_for_server('http://localhost:6868/health', timeout=15)
 
-    def start_frontend(self):
-        """Start the frontend server"""
-        print("\n3. Installing frontend dependencies...")
-        if os.path.exists(os.path.join(self.project_dir, 'node_modules')):
-            print("Frontend node_modules exists, running npm install to ensure dependencies...")
-            
-        if not self.install_dependencies(self.project_dir):
+    def start_frontend(self, install, warm=False):
+        """Start the frontend server, overlapping npm install when node_modules is warm"""
+        if not warm and not install.result():
+            print("❌ Failed to install frontend dependencies")
+            return False
+        if self._launch_frontend():
+            return True
+        if not warm:
+            return False
+
+        # The existing node_modules may be stale; retry once the install is done
+        print("Frontend did not come up, waiting for npm install before retrying...")
+        if not install.result():
             print("❌ Failed to install frontend dependencies")
             return False
+        self._stop_process(self.frontend_process)
+        return self._launch_frontend()
 
-        print("\n4. Starting Frontend Development Server...")
-        self.frontend_process = self.run_command('npm run dev', cwd=self.project_dir)
+    def _launch_frontend(self):
+        """Spawn the frontend dev server and wait for its port to open"""
+        print("\nStarting Frontend Development Server...")
+        if IS_WIN:
+            # Run Vite (the "dev" script) directly: npm.cmd would put a cmd.exe batch
+            # host in front of it, which answers CTRL_BREAK_EVENT by asking
+            # "Terminate batch job (Y/N)?" on this console instead of exiting
+            command = ['node', os.path.join('node_modules', 'vite', 'bin', 'vite.js')]
+        else:
+            command = [self.npm, 'run', 'dev']
+        self.frontend_process = self.run_command(command, cwd=self.project_dir)
         return self.wait_for_server('http://localhost:3000', timeout=30)
 
+    def wait_for_exit(self):
+        """Block until the backend or frontend server exits and return its process"""
+        processes = (self.backend_process, self.frontend_process)
+        for process in processes:
+            if process.poll() is not None:
+                return process
+
+        if IS_WIN:
+            import ctypes.wintypes
+            wait_for_objects = ctypes.windll.kernel32.WaitForMultipleObjects
+            wait_for_objects.restype = ctypes.wintypes.DWORD
+            handles = (ctypes.wintypes.HANDLE * 2)(*(int(p._handle) for p in processes))
+            while True:
+                # Wake up once a second so Python can still deliver Ctrl+C,
+                # which it cannot do while blocked inside a foreign call
+                index = wait_for_objects(2, handles, False, 1000)
+                if index < 2:
+                    processes[index].poll()
+                    return processes[index]
+                if index != 0x102:  # anything but WAIT_TIMEOUT is a failure
+                    raise ctypes.WinError()
+
+        # Wait on each server's own pid in a watcher thread. Unlike
+        # os.waitpid(-1), this never reaps an npm install another thread waits on
+        exited = threading.Event()
+
+        def watch(process):
+            process.wait()
+            exited.set()
+
+        for process in processes:
+            threading.Thread(target=watch, args=(process,), daemon=True).start()
+        exited.wait()
+        return next(p for p in processes if p.poll() is not None)
+
+    def _request_stop(self, process):
+        """Ask a server process to exit without waiting for it"""
+        if process.poll() is not None:
+            return
+        if IS_WIN:
+            # Reaches every process in the child's group
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            process.terminate()
+
+    def _stop_process(self, process):
+        """Stop a single server process, killing its tree if it does not exit within 5 seconds"""
+        self._request_stop(process)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._kill_tree(process)
+
+    def _kill_tree(self, process):
+        """Forcefully stop a process together with any children it started"""
+        if IS_WIN:
+            # kill() only terminates the top-level process; taskkill /T takes the tree
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], capture_output=True)
+        else:
+            process.kill()
+        process.wait()
+
     def cleanup(self):
         """Clean up processes on exit"""
         print("\n👋 Shutting down servers...")
+        with self.install_lock:
+            self.shutting_down = True
+            installs = [p for p in self.install_processes if p.poll() is None]
         try:
-            if self.backend_process:
-                if sys.platform == "win32":
-                    subprocess.run(['taskkill', '/F', '/T', '/PID', str(self.backend_process.pid)], 
-                                check=True, capture_output=True)
-                else:
-                    self.backend_process.terminate()
-                    self.backend_process.wait(timeout=5)
-            
-            if self.frontend_process:
-                if sys.platform == "win32":
-                    subprocess.run(['taskkill', '/F', '/T', '/PID', str(self.frontend_process.pid)],
-                                check=True, capture_output=True)
+            processes = [p for p in (self.backend_process, self.frontend_process) if p]
+            for process in processes:
+                self._request_stop(process)
+
+            # Stop npm installs that are still running so the launcher can exit
+            for process in installs:
+                if IS_WIN:
+                    # Installs share our console group, so CTRL_BREAK_EVENT cannot target them
+                    self._kill_tree(process)
                 else:
-                    self.frontend_process.terminate()
-                    self.frontend_process.wait(timeout=5)
+                    process.terminate()
+            processes += installs
+
+            # Both servers shut down at the same time, so they share one 5 second budget
+            deadline = time.monotonic() + 5
+            for process in processes:
+                try:
+                    process.wait(timeout=max(0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    self._kill_tree(process)
             
             print("✅ Servers stopped successfully!")
         except Exception as e:
@@ -202,24 +341,44 @@ class TriStarApp:
 
         self.ensure_directories()
         
+        # Check if package.json exists
+        if not os.path.exists(self.package_json_path):
+            print("❌ Backend package.json not found!")
+            input("Press Enter to exit...")
+            return
+
+        executor = None
         try:
-            # Start backend server
-            if not self.start_backend():
-                print("❌ Failed to start backend server")
-                self.cleanup()
-                return
-            
-            print("✓ Backend server started successfully")
+            # Install backend and frontend dependencies concurrently. A server
+            # whose node_modules already exists starts right away while npm
+            # install refreshes it; the other starts once its install finishes
+            print("\nInstalling backend and frontend dependencies...")
+            warm_backend = os.path.isdir(self.backend_modules_dir)
+            warm_frontend = os.path.isdir(self.frontend_modules_dir)
+            executor = ThreadPoolExecutor(max_workers=2)
+            # Listed backend first: when both are ready the backend starts first,
+            # since the frontend's dev proxy points at it
+            pending = [
+                (executor.submit(self.install_dependencies, self.backend_dir), "Backend", self.start_backend, warm_backend),
+                (executor.submit(self.install_dependencies, self.project_dir), "Frontend", self.start_frontend, warm_frontend),
+            ]
+            while pending:
+                startable = [entry for entry in pending if entry[3] or entry[0].done()]
+                if not startable:
+                    wait([entry[0] for entry in pending], return_when=FIRST_COMPLETED)
+                    continue
+                for entry in startable:
+                    pending.remove(entry)
+                    install, name, start, warm = entry
+                    if not start(install, warm):
+                        print(f"❌ Failed to start {name.lower()} server")
+                        self.cleanup()
+                        return
 
-            # Start frontend server
-            if not self.start_frontend():
-                print("❌ Failed to start frontend server")
-                self.cleanup()
-                return
-            
-            print("✓ Frontend server started successfully")
+                    print(f"✓ {name} server started successfully")
 
             print("\n🌐 Opening application in your default browser...")
+            import webbrowser
             webbrowser.open('http://localhost:3000')
 
             print("""
@@ -235,15 +394,11 @@ class TriStarApp:
    
 ⚠️ Note: Do not close this window while using the application.
 """)
-            # Keep the script running and monitor processes
-            while True:
-                if self.backend_process.poll() is not None:
-                    print("❌ Backend server stopped unexpectedly!")
-                    break
-                if self.frontend_process.poll() is not None:
-                    print("❌ Frontend server stopped unexpectedly!")
-                    break
-                sleep(1)
+            # Keep the script running until one of the servers exits
+            if self.wait_for_exit() is self.backend_process:
+                print("❌ Backend server stopped unexpectedly!")
+            else:
+                print("❌ Frontend server stopped unexpectedly!")
                 
             self.cleanup()
             
@@ -253,6 +408,10 @@ class TriStarApp:
             print(f"\n❌ Error: {e}")
             self.cleanup()
         finally:
+            if executor:
+                # On failure or Ctrl+C, cleanup() has already stopped running
+                # installs; drop queued ones instead of joining them
+                executor.shutdown(wait=False, cancel_futures=True)
             input("\nPress Enter to exit...")
 
 def main():